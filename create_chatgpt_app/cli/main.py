@@ -2,16 +2,28 @@
 
 import click
 from pathlib import Path
-from rich.console import Console
-from rich.prompt import Prompt, Confirm
+from typing import Optional
+from rich.console import Console, Group
 from rich.panel import Panel
-from rich.table import Table
 
-from create_chatgpt_app.generator import ProjectGenerator
 from create_chatgpt_app.models import ProjectConfig, WidgetConfig
 
 console = Console()
 
+_NEXT_STEPS = (
+    "  1.  cd {project_name}\n"
+    "  2.  python -m venv .venv\n"
+    "  3.  source .venv/bin/activate  # On Windows: .venv\\Scripts\\activate\n"
+    "  4.  pip install -r requirements.txt\n"
+    "  5.  python main.py"
+)
+
+
+def _project_root() -> Optional[Path]:
+    """Return the current project directory, or None if not inside a project."""
+    cwd = Path.cwd()
+    return cwd if (cwd / "main.py").is_file() else None
+
 
 @click.group()
 @click.version_option()
@@ -35,6 +47,10 @@ def init(project_name, name, description, port, host, no_docker, no_tests):
         create-chatgpt-app init my-app
         create-chatgpt-app init --name "My App" --description "My awesome app"
     """
+    from rich.prompt import Confirm, Prompt
+
+    from create_chatgpt_app.generator import ProjectGenerator
+
     console.print(Panel.fit(
         "[bold cyan]create-chatgpt-app[/bold cyan]\n"
         "Let's create your ChatGPT app!",
@@ -82,7 +98,7 @@ def init(project_name, name, description, port, host, no_docker, no_tests):
             default="inline"
         )
 
-        widgets.append(WidgetConfig(
+        widgets = [WidgetConfig(
             identifier=widget_id,
             title=widget_title,
             widget_type=widget_type,
@@ -90,7 +106,7 @@ def init(project_name, name, description, port, host, no_docker, no_tests):
             invoking=f"Loading {widget_title}",
             invoked=f"{widget_title} loaded",
             response_text=f"{widget_title} rendered successfully!"
-        ))
+        )]
 
     # Create project configuration
     config = ProjectConfig(
@@ -109,19 +125,13 @@ def init(project_name, name, description, port, host, no_docker, no_tests):
         generator = ProjectGenerator(config)
         project_path = generator.generate()
 
-        console.print(f"\n[green]✓[/green] Project created successfully at: [cyan]{project_path}[/cyan]")
-
-        # Display next steps
-        console.print("\n[bold yellow]Next steps:[/bold yellow]")
-        table = Table(show_header=False, box=None, padding=(0, 2))
-        table.add_row("1.", f"cd {config.project_name}")
-        table.add_row("2.", "python -m venv .venv")
-        table.add_row("3.", "source .venv/bin/activate  # On Windows: .venv\\Scripts\\activate")
-        table.add_row("4.", "pip install -r requirements.txt")
-        table.add_row("5.", "python main.py")
-        console.print(table)
-
-        console.print(f"\n[dim]Your server will be running at http://{host}:{port}[/dim]")
+        # Emit the whole success block, including next steps, in a single write
+        console.print(Group(
+            f"\n[green]✓[/green] Project created successfully at: [cyan]{project_path}[/cyan]",
+            "\n[bold yellow]Next steps:[/bold yellow]",
+            _NEXT_STEPS.format(project_name=config.project_name),
+            f"\n[dim]Your server will be running at http://{host}:{port}[/dim]",
+        ))
 
     except Exception as e:
         console.print(f"[red]✗[/red] Error creating project: {e}")
@@ -139,8 +149,11 @@ def add_widget(identifier, title, widget_type):
         create-chatgpt-app add-widget --identifier my-widget --title "My Widget"
         create-chatgpt-app add-widget  # Interactive mode
     """
+    from rich.prompt import Prompt
+
     # Check if we're in a project directory
-    if not Path("main.py").exists():
+    project_root = _project_root()
+    if project_root is None:
         console.print("[red]✗[/red] Error: Not in a ChatGPT app project directory.")
         console.print("[dim]Run 'create-chatgpt-app init' first or navigate to your project directory.[/dim]")
         raise click.Abort()
@@ -180,8 +193,8 @@ def add_widget(identifier, title, widget_type):
     )
 
     try:
-        from chatgpt_scaffold.generator import WidgetAdder
-        adder = WidgetAdder()
+        from create_chatgpt_app.generator import WidgetAdder
+        adder = WidgetAdder(project_root)
         adder.add_widget(widget)
 
         console.print(f"\n[green]✓[/green] Widget '{identifier}' added successfully!")
@@ -204,8 +217,10 @@ def add_tool(identifier, title, description, no_widget):
         create-chatgpt-app add-tool --identifier my-tool --title "My Tool"
         create-chatgpt-app add-tool  # Interactive mode
     """
+    from rich.prompt import Confirm, Prompt
+
     # Check if we're in a project directory
-    if not Path("main.py").exists():
+    if _project_root() is None:
         console.print("[red]✗[/red] Error: Not in a ChatGPT app project directory.")
         console.print("[dim]Run 'create-chatgpt-app init' first or navigate to your project directory.[/dim]")
         raise click.Abort()
@@ -268,6 +283,8 @@ def add_tool(identifier, title, description, no_widget):
 @cli.command()
 def list_templates():
     """List available project templates."""
+    from rich.table import Table
+
     console.print(Panel.fit(
         "[bold cyan]Available Templates[/bold cyan]",
         border_style="cyan"
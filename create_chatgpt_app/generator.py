@@ -1,26 +1,196 @@
 """Project and widget generator for create-chatgpt-app."""
 
+import ast
+import dataclasses
+import functools
+import importlib.resources
+import io
+import json
 import os
 import re
+import secrets
+import shutil
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Optional
+from typing import Any, Dict, List, Optional, Tuple
 
-from jinja2 import Environment, PackageLoader, select_autoescape
+from jinja2 import (
+    Environment,
+    FileSystemBytecodeCache,
+    PackageLoader,
+    Template,
+    select_autoescape,
+)
 
 from create_chatgpt_app.models import ProjectConfig, WidgetConfig
 
+# Matches the `widgets: List[...] = [` block in a generated main.py
+_WIDGETS_RE = re.compile(rb"(widgets:\s*List\[[^\]]+\]\s*=\s*\[)(.*?)(\n\])", re.DOTALL)
+_WIDGET_CLASS_RE = re.compile(rb"@dataclass\(frozen=True\)\s*class\s+(\w+Widget):")
+
+# Escapes inline widget HTML for embedding in a double-quoted Python string
+_HTML_ESCAPE = str.maketrans({"\\": "\\\\", '"': '\\"'})
+
+# Widget class names detected in main.py files, keyed by _stat_key()
+_CLASS_NAME_CACHE: Dict[Tuple[str, int, int], str] = {}
+
+# Project config snapshot written next to main.py by `init`
+_CACHE_FILE = ".cga-cache.json"
+
+# (template name, output path relative to the project, context keys to render with)
+_FileSpec = Tuple[str, str, Tuple[str, ...]]
+
+_PROJECT_FILES: Tuple[_FileSpec, ...] = (
+    ("main.py.j2", "main.py", ("app_name", "description", "port", "host", "widgets")),
+    (
+        "README.md.j2",
+        "README.md",
+        ("project_name", "app_name", "description", "port", "host", "widgets"),
+    ),
+)
+_DOCKER_FILES: Tuple[_FileSpec, ...] = (
+    ("Dockerfile.j2", "Dockerfile", ("python_version", "port")),
+)
+_TEST_FILES: Tuple[_FileSpec, ...] = (
+    ("test_main.py.j2", "tests/test_main.py", ("app_name", "widgets")),
+)
+
+# (package data file, output path relative to the project) for files copied verbatim
+_StaticFileSpec = Tuple[str, str]
+
+_STATIC_FILES: Tuple[_StaticFileSpec, ...] = (
+    ("requirements.txt", "requirements.txt"),
+    ("gitignore", ".gitignore"),
+)
+_DOCKER_STATIC_FILES: Tuple[_StaticFileSpec, ...] = (("dockerignore", ".dockerignore"),)
+
+
+def _stat_key(path: Path) -> Tuple[str, int, int]:
+    """Identify a file's current version by its resolved path, mtime and size."""
+    st = path.stat()
+    return str(path.resolve()), st.st_mtime_ns, st.st_size
+
+
+def _find_widget_class_name(source: bytes) -> str:
+    """Find the frozen ``*Widget`` dataclass defined at the top level of main.py."""
+    # Fast path: a single unindented match is the class itself. Parsing the module
+    # costs milliseconds, so the AST is only consulted when the text scan is
+    # ambiguous (no match, or look-alikes e.g. inside a docstring).
+    matches = [
+        match.group(1)
+        for match in _WIDGET_CLASS_RE.finditer(source)
+        if match.start() == 0 or source[match.start() - 1] == ord("\n")
+    ]
+    if len(matches) == 1:
+        return matches[0].decode("utf-8")
+
+    try:
+        tree = ast.parse(source)
+    except (SyntaxError, ValueError):
+        # Files that do not parse keep the first text match
+        return matches[0].decode("utf-8") if matches else "Widget"
+
+    for node in tree.body:
+        if isinstance(node, ast.ClassDef) and node.name.endswith("Widget"):
+            if any(_is_frozen_dataclass(decorator) for decorator in node.decorator_list):
+                return node.name
+
+    # Default fallback
+    return "Widget"
+
+
+def _is_frozen_dataclass(decorator: ast.expr) -> bool:
+    """Check whether a decorator node is ``@dataclass(frozen=True)``."""
+    return (
+        isinstance(decorator, ast.Call)
+        and isinstance(decorator.func, ast.Name)
+        and decorator.func.id == "dataclass"
+        and any(
+            kw.arg == "frozen" and isinstance(kw.value, ast.Constant) and kw.value.value is True
+            for kw in decorator.keywords
+        )
+    )
+
+
+def _write(path: Path, text: str) -> None:
+    """Write text to a file as UTF-8 without going through a text wrapper."""
+    path.write_bytes(text.encode("utf-8"))
+
+
+def _main_py_signature(project_path: Path) -> List[int]:
+    """Identify the current version of a project's main.py by its mtime and size."""
+    st = (project_path / "main.py").stat()
+    return [st.st_mtime_ns, st.st_size]
+
+
+def _save_project_cache(project_path: Path, config: ProjectConfig, widget_class: str) -> None:
+    """Persist the project config, keyed to the current main.py signature."""
+    data = {
+        "main_py_signature": _main_py_signature(project_path),
+        "widget_class": widget_class,
+        "config": dataclasses.asdict(config),
+    }
+    _write(project_path / _CACHE_FILE, json.dumps(data, indent=2))
+
+
+def _load_project_cache(project_path: Path) -> Optional[Tuple[ProjectConfig, str]]:
+    """Load the cached project config and widget class name.
+
+    Returns None if there is no cache, it cannot be read, or main.py has been
+    modified since it was written.
+    """
+    try:
+        data = json.loads((project_path / _CACHE_FILE).read_text(encoding="utf-8"))
+        if data["main_py_signature"] != _main_py_signature(project_path):
+            return None
+        config_data = data["config"]
+        widgets = [WidgetConfig(**widget) for widget in config_data.pop("widgets")]
+        return ProjectConfig(widgets=widgets, **config_data), data["widget_class"]
+    except (OSError, ValueError, KeyError, TypeError):
+        return None
+
+
+def _discard_project_cache(project_path: Path) -> None:
+    """Remove a project cache that no longer describes main.py."""
+    try:
+        (project_path / _CACHE_FILE).unlink(missing_ok=True)
+    except OSError:
+        pass
+
+
+@functools.lru_cache(maxsize=1)
+def _get_env() -> Environment:
+    """Return the shared Jinja2 environment, persisting compiled templates on disk.
+
+    The bytecode cache uses Jinja's default per-user directory, which it creates
+    as 0700 and checks for ownership before loading anything from it. If that
+    directory cannot be created or fails the check, templates are compiled
+    without a cache instead.
+    """
+    try:
+        bytecode_cache: Optional[FileSystemBytecodeCache] = FileSystemBytecodeCache()
+    except (OSError, RuntimeError):
+        bytecode_cache = None
+
+    return Environment(
+        loader=PackageLoader("create_chatgpt_app", "templates"),
+        autoescape=select_autoescape(),
+        trim_blocks=True,
+        lstrip_blocks=True,
+        bytecode_cache=bytecode_cache,
+    )
+
 
 class ProjectGenerator:
     """Generate a new ChatGPT app project from templates."""
 
     def __init__(self, config: ProjectConfig):
         self.config = config
-        self.env = Environment(
-            loader=PackageLoader("create_chatgpt_app", "templates"),
-            autoescape=select_autoescape(),
-            trim_blocks=True,
-            lstrip_blocks=True,
-        )
+        self.env = _get_env()
+        self._templates: Dict[str, Template] = {
+            template_name: self.env.get_template(template_name)
+            for template_name, _, _ in _PROJECT_FILES + _DOCKER_FILES + _TEST_FILES
+        }
 
     def generate(self) -> Path:
         """Generate the project structure and files."""
@@ -30,145 +200,174 @@ class ProjectGenerator:
         if project_path.exists():
             raise ValueError(f"Directory '{self.config.project_name}' already exists")
 
-        project_path.mkdir(parents=True)
+        # Build the project in a sibling temporary directory and move it into place in one
+        # rename, so a failed run never leaves a half-written project behind
+        project_path.parent.mkdir(parents=True, exist_ok=True)
+        # A plain mkdir (unlike mkdtemp's 0700) gives the project the usual umask-based mode
+        tmp_path = project_path.parent / f".cga-{secrets.token_hex(4)}"
+        tmp_path.mkdir()
+        try:
+            self._write_project(tmp_path)
+            if project_path.exists():
+                raise ValueError(f"Directory '{self.config.project_name}' already exists")
+            tmp_path.replace(project_path)
+        except BaseException:
+            shutil.rmtree(tmp_path, ignore_errors=True)
+            raise
 
-        # Generate files
-        self._generate_main_py(project_path)
-        self._generate_requirements_txt(project_path)
-        self._generate_readme(project_path)
-        self._generate_gitignore(project_path)
+        return project_path
 
+    def _write_project(self, project_path: Path) -> None:
+        """Write every project file into an existing, empty directory."""
+        files = list(_PROJECT_FILES)
+        static_files = list(_STATIC_FILES)
         if self.config.include_docker:
-            self._generate_dockerfile(project_path)
-            self._generate_dockerignore(project_path)
-
+            files.extend(_DOCKER_FILES)
+            static_files.extend(_DOCKER_STATIC_FILES)
         if self.config.include_tests:
-            self._generate_tests(project_path)
-
-        return project_path
+            (project_path / "tests").mkdir()
+            _write(project_path / "tests" / "__init__.py", "")
+            files.extend(_TEST_FILES)
+
+        # Generate files; each one is independent, so render and write them concurrently
+        context = self._build_context()
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            copies = [
+                executor.submit(self._copy_static_file, project_path, spec) for spec in static_files
+            ]
+            rendered = dict(
+                zip(
+                    (rel_path for _, rel_path, _ in files),
+                    executor.map(
+                        lambda spec: self._render_file(project_path, context, spec), files
+                    ),
+                )
+            )
+            for copy in copies:
+                copy.result()
 
-    def _generate_main_py(self, project_path: Path) -> None:
-        """Generate main.py file."""
-        template = self.env.get_template("main.py.j2")
-        content = template.render(
-            app_name=self.config.app_name,
-            description=self.config.description,
-            port=self.config.port,
-            host=self.config.host,
-            widgets=self.config.widgets,
-        )
-        (project_path / "main.py").write_text(content)
-
-    def _generate_requirements_txt(self, project_path: Path) -> None:
-        """Generate requirements.txt file."""
-        template = self.env.get_template("requirements.txt.j2")
-        content = template.render()
-        (project_path / "requirements.txt").write_text(content)
-
-    def _generate_readme(self, project_path: Path) -> None:
-        """Generate README.md file."""
-        template = self.env.get_template("README.md.j2")
-        content = template.render(
-            project_name=self.config.project_name,
-            app_name=self.config.app_name,
-            description=self.config.description,
-            port=self.config.port,
-            host=self.config.host,
-            widgets=self.config.widgets,
+        # Remember the config so later commands can skip re-scanning main.py
+        _save_project_cache(
+            project_path, self.config, _find_widget_class_name(rendered["main.py"])
         )
-        (project_path / "README.md").write_text(content)
-
-    def _generate_gitignore(self, project_path: Path) -> None:
-        """Generate .gitignore file."""
-        template = self.env.get_template("gitignore.j2")
-        content = template.render()
-        (project_path / ".gitignore").write_text(content)
-
-    def _generate_dockerfile(self, project_path: Path) -> None:
-        """Generate Dockerfile."""
-        template = self.env.get_template("Dockerfile.j2")
-        content = template.render(
-            python_version=self.config.python_version,
-            port=self.config.port,
-        )
-        (project_path / "Dockerfile").write_text(content)
-
-    def _generate_dockerignore(self, project_path: Path) -> None:
-        """Generate .dockerignore file."""
-        template = self.env.get_template("dockerignore.j2")
-        content = template.render()
-        (project_path / ".dockerignore").write_text(content)
-
-    def _generate_tests(self, project_path: Path) -> None:
-        """Generate test files."""
-        tests_dir = project_path / "tests"
-        tests_dir.mkdir()
-
-        template = self.env.get_template("test_main.py.j2")
-        content = template.render(
-            app_name=self.config.app_name,
-            widgets=self.config.widgets,
-        )
-        (tests_dir / "test_main.py").write_text(content)
-        (tests_dir / "__init__.py").write_text("")
+
+    def _render_file(self, project_path: Path, context: Dict[str, Any], spec: _FileSpec) -> bytes:
+        """Render a single template into the project and return its content."""
+        template_name, rel_path, keys = spec
+        content = self._templates[template_name].render({key: context[key] for key in keys})
+        encoded = content.encode("utf-8")
+        (project_path / rel_path).write_bytes(encoded)
+        return encoded
+
+    def _copy_static_file(self, project_path: Path, spec: _StaticFileSpec) -> None:
+        """Copy a file that needs no templating straight from the package data."""
+        source_name, rel_path = spec
+        source = importlib.resources.files("create_chatgpt_app") / "templates" / source_name
+        (project_path / rel_path).write_bytes(source.read_bytes())
+
+    def _build_context(self) -> Dict[str, Any]:
+        """Collect every value the templates may render."""
+        return {
+            "project_name": self.config.project_name,
+            "app_name": self.config.app_name,
+            "description": self.config.description,
+            "port": self.config.port,
+            "host": self.config.host,
+            "widgets": self.config.widgets,
+            "python_version": self.config.python_version,
+        }
 
 
 class WidgetAdder:
     """Add a widget to an existing project."""
 
+    def __init__(self, project_path: Optional[Path] = None):
+        self.project_path = project_path or Path.cwd()
+
     def add_widget(self, widget: WidgetConfig) -> None:
         """Add a widget to the main.py file."""
-        main_py_path = Path("main.py")
+        main_py_path = self.project_path / "main.py"
 
         if not main_py_path.exists():
-            raise FileNotFoundError("main.py not found in current directory")
+            raise FileNotFoundError(f"main.py not found in {self.project_path}")
 
-        content = main_py_path.read_text()
+        source = main_py_path.read_bytes()
 
-        # Generate widget code
-        widget_code = self._generate_widget_code(widget)
+        # Generate widget code, taking the class name from the project cache when it is fresh
+        cached = _load_project_cache(self.project_path)
+        if cached is not None:
+            config, class_name = cached
+        else:
+            class_name = self._get_widget_class_name(main_py_path, source)
+            # A cache that no longer matches main.py can never become valid again
+            _discard_project_cache(self.project_path)
+        widget_code = self._generate_widget_code(widget, class_name)
 
         # Find the widgets list and add the new widget
-        # Look for the pattern: widgets: List[...] = [
-        pattern = r"(widgets:\s*List\[[^\]]+\]\s*=\s*\[)(.*?)(\n\])"
-        match = re.search(pattern, content, re.DOTALL)
+        match = _WIDGETS_RE.search(source)
 
         if not match:
             raise ValueError("Could not find widgets list in main.py")
 
-        before = match.group(1)
-        existing_widgets = match.group(2)
-        after = match.group(3)
-
         # Add comma if there are existing widgets
-        separator = "," if existing_widgets.strip() else ""
-
-        # Construct new content
-        new_widgets_section = f"{before}{existing_widgets}{separator}\n{widget_code}{after}"
-        new_content = content[: match.start()] + new_widgets_section + content[match.end() :]
-
-        # Write back
-        main_py_path.write_text(new_content)
-
-    def _generate_widget_code(self, widget: WidgetConfig) -> str:
-        """Generate Python code for a widget."""
-        html = self._generate_widget_html(widget)
-
-        code = f"""    {self._get_widget_class_name()}(
+        separator = "," if match.group(2).strip() else ""
+
+        # Splice the new widget in just before the line ending that precedes the closing
+        # bracket, using the file's own line endings; only the tail after the insertion
+        # point is rewritten, the prefix is left in place
+        insert_at = match.end(2)
+        newline = "\n"
+        if match.group(2).endswith(b"\r"):
+            insert_at -= 1
+            newline = "\r\n"
+        insertion = f"{separator}\n{widget_code}".replace("\n", newline)
+        with main_py_path.open("r+b") as f:
+            f.seek(insert_at)
+            f.write(insertion.encode("utf-8"))
+            f.write(memoryview(source)[insert_at:])
+        _CLASS_NAME_CACHE[_stat_key(main_py_path)] = class_name
+
+        if cached is not None:
+            config = dataclasses.replace(config, widgets=[*config.widgets, widget])
+            try:
+                _save_project_cache(self.project_path, config, class_name)
+            except OSError:
+                # main.py is already updated; a stale cache is simply ignored next time
+                pass
+
+    @staticmethod
+    @functools.lru_cache(maxsize=128)
+    def _generate_widget_code(widget: WidgetConfig, class_name: str) -> str:
+        """Generate Python code for a widget.
+
+        Output depends only on the (hashable) widget config and class name, so
+        results are memoized.
+        """
+        html = WidgetAdder._generate_widget_html(widget)
+
+        buf = io.StringIO()
+        buf.write(
+            f"""    {class_name}(
         identifier="{widget.identifier}",
         title="{widget.title}",
         template_uri="{widget.template_uri}",
         invoking="{widget.invoking}",
         invoked="{widget.invoked}",
         html=(
-{self._indent_multiline(html, 12)}
+"""
+        )
+        buf.write(WidgetAdder._indent_multiline(html, 12))
+        buf.write(
+            f"""
         ),
         response_text="{widget.response_text}",
     )"""
+        )
 
-        return code
+        return buf.getvalue()
 
-    def _generate_widget_html(self, widget: WidgetConfig) -> str:
+    @staticmethod
+    def _generate_widget_html(widget: WidgetConfig) -> str:
         """Generate HTML for a widget based on its type."""
         root_id = widget.identifier.replace("-", "_")
 
@@ -194,24 +393,29 @@ class WidgetAdder:
                 f"</div>"
             )
             # Escape the HTML for Python string
-            escaped = html_content.replace("\\", "\\\\").replace('"', '\\"')
+            escaped = html_content.translate(_HTML_ESCAPE)
             return f'"{escaped}"'
 
-    def _get_widget_class_name(self) -> str:
-        """Detect the widget class name from main.py."""
-        main_py_path = Path("main.py")
-        content = main_py_path.read_text()
-
-        # Look for @dataclass class definitions
-        match = re.search(r"@dataclass\(frozen=True\)\s*class\s+(\w+Widget):", content)
-        if match:
-            return match.group(1)
-
-        # Default fallback
-        return "Widget"
-
-    def _indent_multiline(self, text: str, spaces: int) -> str:
+    def _get_widget_class_name(self, main_py_path: Path, source: bytes) -> str:
+        """Detect the widget class name from the contents of main.py."""
+        key = _stat_key(main_py_path)
+        class_name = _CLASS_NAME_CACHE.get(key)
+        if class_name is None:
+            class_name = _find_widget_class_name(source)
+            _CLASS_NAME_CACHE[key] = class_name
+        return class_name
+
+    @staticmethod
+    def _indent_multiline(text: str, spaces: int) -> str:
         """Indent multiline text."""
+        if "\n" not in text:
+            return " " * spaces + text if text else text
+
         indent = " " * spaces
-        lines = text.split("\n")
-        return "\n".join(indent + line if line else line for line in lines)
+        buf = io.StringIO()
+        # Iterating a StringIO splits on "\n" only, keeping line endings
+        for line in io.StringIO(text):
+            if line != "\n":
+                buf.write(indent)
+            buf.write(line)
+        return buf.getvalue()
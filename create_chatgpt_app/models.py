@@ -4,7 +4,7 @@ from dataclasses import dataclass, field
 from typing import List, Literal
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class WidgetConfig:
     """Configuration for a widget."""
 
@@ -20,7 +20,7 @@ class WidgetConfig:
     html_content: str = ""
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class ProjectConfig:
     """Configuration for a project."""
 
@@ -0,0 +1,140 @@
+"""Tests for the project generator and widget adder."""
+
+import json
+
+import pytest
+
+from create_chatgpt_app import generator
+from create_chatgpt_app.generator import ProjectGenerator, WidgetAdder
+from create_chatgpt_app.models import ProjectConfig, WidgetConfig
+
+MAIN_PY_WITH_WIDGET = """from dataclasses import dataclass
+from typing import List
+
+
+@dataclass(frozen=True)
+class MyWidget:
+    identifier: str
+    title: str
+    template_uri: str
+    invoking: str
+    invoked: str
+    html: str
+    response_text: str
+
+
+widgets: List[MyWidget] = [
+    MyWidget(
+        identifier="existing",
+        title="Existing",
+        template_uri="ui://widget/existing.html",
+        invoking="Loading",
+        invoked="Loaded",
+        html="<div></div>",
+        response_text="Done",
+    )
+]
+"""
+
+MAIN_PY_EMPTY = MAIN_PY_WITH_WIDGET[: MAIN_PY_WITH_WIDGET.index("    MyWidget(")] + "]\n"
+
+
+def make_widget(identifier: str = "new-widget") -> WidgetConfig:
+    return WidgetConfig(
+        identifier=identifier,
+        title="New Widget",
+        widget_type="inline",
+        template_uri=f"ui://widget/{identifier}.html",
+        invoking="Loading New Widget",
+        invoked="New Widget loaded",
+        response_text="New Widget rendered successfully!",
+    )
+
+
+def load_widgets(source: bytes) -> list:
+    """Execute a main.py fixture and return its widgets list."""
+    namespace: dict = {}
+    exec(compile(source, "main.py", "exec"), namespace)
+    return namespace["widgets"]
+
+
+@pytest.mark.parametrize("newline", ["\n", "\r\n"], ids=["lf", "crlf"])
+@pytest.mark.parametrize(
+    "template, existing",
+    [(MAIN_PY_WITH_WIDGET, ["existing"]), (MAIN_PY_EMPTY, [])],
+    ids=["existing-widget", "empty-list"],
+)
+def test_add_widget_splices_main_py(tmp_path, newline, template, existing):
+    main_py = tmp_path / "main.py"
+    main_py.write_bytes(template.replace("\n", newline).encode("utf-8"))
+
+    WidgetAdder(tmp_path).add_widget(make_widget("first"))
+    WidgetAdder(tmp_path).add_widget(make_widget("second"))
+
+    source = main_py.read_bytes()
+    if newline == "\r\n":
+        assert source.count(b"\n") == source.count(b"\r\n")
+    else:
+        assert b"\r" not in source
+    widgets = load_widgets(source)
+    assert [w.identifier for w in widgets] == existing + ["first", "second"]
+    assert all(type(w).__name__ == "MyWidget" for w in widgets)
+
+
+def test_add_widget_without_widgets_list(tmp_path):
+    (tmp_path / "main.py").write_text("print('hello')\n")
+
+    with pytest.raises(ValueError, match="Could not find widgets list"):
+        WidgetAdder(tmp_path).add_widget(make_widget())
+
+
+@pytest.fixture
+def project(tmp_path, monkeypatch):
+    """A freshly generated project with no widgets."""
+    monkeypatch.chdir(tmp_path)
+    config = ProjectConfig(project_name="demo", app_name="demo", description="Demo app")
+    return ProjectGenerator(config).generate()
+
+
+def test_project_cache_hit(project, monkeypatch):
+    cached = generator._load_project_cache(project)
+    assert cached is not None
+    config, class_name = cached
+    assert config.project_name == "demo"
+    assert class_name == "AppWidget"
+
+    def fail(*args):
+        raise AssertionError("main.py should not be scanned on a cache hit")
+
+    monkeypatch.setattr(WidgetAdder, "_get_widget_class_name", fail)
+    WidgetAdder(project).add_widget(make_widget())
+
+    config, _ = generator._load_project_cache(project)
+    assert [w.identifier for w in config.widgets] == ["new-widget"]
+
+
+def test_project_cache_miss(project):
+    (project / ".cga-cache.json").unlink()
+
+    WidgetAdder(project).add_widget(make_widget())
+
+    assert generator._load_project_cache(project) is None
+    assert not (project / ".cga-cache.json").exists()
+    assert b'identifier="new-widget"' in (project / "main.py").read_bytes()
+
+
+def test_project_cache_stale(project):
+    main_py = project / "main.py"
+    main_py.write_bytes(main_py.read_bytes() + b"# edited by hand\n")
+    assert generator._load_project_cache(project) is None
+
+    WidgetAdder(project).add_widget(make_widget())
+
+    assert not (project / ".cga-cache.json").exists()
+    assert b'identifier="new-widget"' in main_py.read_bytes()
+
+
+def test_project_cache_records_main_py_signature(project):
+    data = json.loads((project / ".cga-cache.json").read_text())
+    stat = (project / "main.py").stat()
+    assert data["main_py_signature"] == [stat.st_mtime_ns, stat.st_size]